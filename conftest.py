@@ -1,7 +1,11 @@
 from os import environ, makedirs
 
+from matplotlib import use
 from pytest import fixture
 
+# tests only write figures to files: never select an interactive backend
+use("Agg")
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -21,6 +25,12 @@ def pytest_addoption(parser):
         default="output/tests",
         help="choose the location of output materials",
     )
+    parser.addoption(
+        "--no-plots",
+        action="store_true",
+        default=False,
+        help="do not render plots and graphs in tests",
+    )
 
 
 def pytest_generate_tests(metafunc):
@@ -43,6 +53,21 @@ def debug_graph(request):
     return request.config.option.debug_graph
 
 
+def _no_plot(*args, **kwargs):
+    pass
+
+
+@fixture(autouse=True)
+def no_plots(request, monkeypatch):
+    """Replaces plotting and graph rendering by no-op with `--no-plots`."""
+    if not request.config.option.no_plots:
+        return
+    monkeypatch.setattr("matplotlib.pyplot.savefig", _no_plot)
+    for name in ("savegraph", "plot_auto", "plot_array_1d_hist"):
+        if hasattr(request.module, name):
+            monkeypatch.setattr(request.module, name, _no_plot)
+
+
 @fixture()
 def test_name():
     """Returns corrected full name of a test."""
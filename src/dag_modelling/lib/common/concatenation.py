@@ -1,3 +1,5 @@
+from numpy import concatenate
+
 from ...core.input_strategy import AddNewInputAddAndKeepSingleOutput
 from ...core.type_functions import check_node_has_inputs, check_dimension_of_inputs, check_dtype_of_inputs
 from ..abstract import ManyToOneNode
@@ -7,6 +9,10 @@ class Concatenation(ManyToOneNode):
     """
     Creates a node with a single data output which is a concatenated data of the inputs.
     Now supports only 1d arrays.
+
+    The data is copied on each call, thus any output may be connected. In order to avoid
+    copying use `ViewConcat`, which makes the parent outputs to write directly to the
+    slices of its own buffer, but requires the parent outputs to be reallocatable.
     """
 
     __slots__ = (
@@ -45,11 +51,10 @@ class Concatenation(ManyToOneNode):
         self._sizes = tuple(sizes)
 
     def _function(self):
-        _output = self.outputs["result"]
-        data = _output._data
-        for offset, _input in zip(self._offsets, self.inputs):
-            size = _input.dd.shape[0]
-            data[offset : offset + size] = _input.data[:]
+        for callback in self._input_nodes_callbacks:
+            callback()
+
+        concatenate(self._input_data, out=self._output_data)
 
     @property
     def sizes(self) -> list[int]:
@@ -3,9 +3,11 @@ from __future__ import annotations
 from abc import abstractmethod
 from typing import TYPE_CHECKING, Literal
 
-from numba import njit
-from numpy import add, matmul, sqrt
+from numba import njit, typeof
+from numpy import add, broadcast_to, copyto, empty, matmul, multiply, sqrt, tril
+from scipy.linalg.blas import get_blas_funcs
 
+from ...core.exception import UnclosedGraphError
 from ...core.type_functions import (
     check_inputs_are_matrices_or_diagonals,
     check_inputs_are_matrix_multipliable,
@@ -16,22 +18,27 @@ from ...core.type_functions import (
 from ..abstract import BlockToOneNode
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from numba.core.registry import CPUDispatcher
     from numpy import double
     from numpy.random import Generator
     from numpy.typing import NDArray
 
 
-MonteCarloLocModes = ("asimov", "normal-stats", "poisson")
+MonteCarloLocModes = frozenset(("asimov", "normal-stats", "poisson"))
 
-MonteCarloLocScaleModes = ("normal", "covariance")
+MonteCarloLocScaleModes = frozenset(("normal", "covariance"))
 
-MonteCarloShapeModes = ("normal-unit",)
+MonteCarloShapeModes = frozenset(("normal-unit",))
+
+MonteCarloModes = MonteCarloLocModes | MonteCarloLocScaleModes | MonteCarloShapeModes
 
-MonteCarloModes = (
-    *MonteCarloLocModes,
-    *MonteCarloLocScaleModes,
-    *MonteCarloShapeModes,
-)
+
+def _specialize(kernel: CPUDispatcher, *args) -> Callable:
+    """Compile the numba kernel for the types of the arguments and return the compiled
+    function, which is called without the type dispatching."""
+    return kernel.compile(tuple(typeof(arg) for arg in args))
 
 
 def _random_with_covariance_L(
@@ -39,28 +46,45 @@ def _random_with_covariance_L(
     cov_L: NDArray[double],
     result: NDArray[double],
     gen: Generator,
+    kernel: Callable,
 ) -> None:
     if cov_L.ndim == 1:
-        _random_with_covariance_L_1d(mean, cov_L, result, gen)
+        _random_with_covariance_L_1d(mean, cov_L, result, gen, kernel)
     else:
-        _random_with_covariance_L_2d(mean, cov_L, result, gen)
+        _random_with_covariance_L_2d(mean, cov_L, result, gen, kernel)
 
 
-@njit(cache=True)
 def _random_with_covariance_L_1d(
     mean: NDArray[double],
     cov_L: NDArray[double],
     result: NDArray[double],
     gen: Generator,
+    shift_and_scale: Callable,
 ) -> None:
-    for i in range(len(result)):
-        result[i] = mean[i] + cov_L[i] * gen.normal()
+    _random_normal(mean, cov_L, result, gen, shift_and_scale)
 
 
-@njit(cache=True)
-def _random_fill_normal(data: NDArray[double], gen: Generator) -> None:
-    for i in range(len(data)):
-        data[i] = gen.normal()
+def _bind_trmv(
+    cov_L: NDArray, result: NDArray
+) -> tuple[Callable, NDArray | None, NDArray, int, int]:
+    """Bind BLAS trmv for L and the result, return the routine, the buffer for L, the
+    matrix to pass and the `lower` and `trans` flags.
+
+    The routine is chosen for the dtype of the result: only then the product is computed
+    in place. L of a different dtype is copied to a buffer of the result dtype before each
+    product. BLAS reads C ordered L as Lᵀ, therefore Lᵀ is passed as upper triangular
+    and transposed back.
+    """
+    trmv = get_blas_funcs("trmv", dtype=result.dtype)
+    if cov_L.dtype == result.dtype:
+        cov_L_buffer = None
+        matrix = cov_L
+    else:
+        cov_L_buffer = matrix = empty(cov_L.shape, dtype=result.dtype, order="F")
+
+    if matrix.flags.f_contiguous:
+        return trmv, cov_L_buffer, matrix, 1, 0
+    return trmv, cov_L_buffer, matrix.T, 0, 1
 
 
 def _random_with_covariance_L_2d(
@@ -68,36 +92,95 @@ def _random_with_covariance_L_2d(
     cov_L: NDArray[double],
     result: NDArray[double],
     gen: Generator,
+    kernel: tuple[Callable, NDArray | None, NDArray, int, int],
 ) -> None:
-    _random_fill_normal(result, gen)
-    matmul(cov_L, result, out=result)
+    trmv, cov_L_buffer, matrix, lower, trans = kernel
+    if cov_L_buffer is not None:
+        copyto(cov_L_buffer, cov_L)
+    gen.standard_normal(dtype=result.dtype, out=result)
+    trmv(matrix, result, lower=lower, trans=trans, overwrite_x=1)
     add(result, mean, out=result)
 
 
 @njit(cache=True)
+def _shift_and_scale(
+    mean: NDArray[double],
+    scale: NDArray[double],
+    result: NDArray[double],
+) -> None:
+    for i in range(len(result)):
+        result[i] = mean[i] + scale[i] * result[i]
+
+
 def _random_normal(
     mean: NDArray[double],
     errors: NDArray[double],
     result: NDArray[double],
     gen: Generator,
+    shift_and_scale: Callable,
 ) -> None:
-    for i in range(len(result)):
-        result[i] = mean[i] + errors[i] * gen.normal()
+    gen.standard_normal(dtype=result.dtype, out=result)
+    shift_and_scale(mean, errors, result)
 
 
 @njit(cache=True)
+def _shift_and_scale_stats(mean: NDArray[double], result: NDArray[double]) -> None:
+    for i in range(len(result)):
+        result[i] = mean[i] + sqrt(mean[i]) * result[i]
+
+
 def _random_normal_stats(
-    mean: NDArray[double], result: NDArray[double], gen: Generator
+    mean: NDArray[double],
+    result: NDArray[double],
+    gen: Generator,
+    shift_and_scale: Callable,
 ) -> None:
-    func = lambda x: x + sqrt(x) * gen.normal()
-    for i in range(len(result)):
-        result[i] = func(mean[i])
+    gen.standard_normal(dtype=result.dtype, out=result)
+    shift_and_scale(mean, result)
 
 
-@njit(cache=True)
 def _poisson(mean: NDArray[double], result: NDArray[double], gen: Generator):
-    for i in range(len(result)):
-        result[i] = gen.poisson(mean[i])
+    result[:] = gen.poisson(mean)
+
+
+def _samples_asimov(mean: NDArray[double], n_samples: int) -> NDArray[double]:
+    return broadcast_to(mean, (n_samples, *mean.shape)).copy()
+
+
+def _samples_normal(
+    mean: NDArray[double], errors: NDArray[double], n_samples: int, gen: Generator
+) -> NDArray[double]:
+    result = gen.standard_normal(size=(n_samples, *mean.shape), dtype=mean.dtype)
+    multiply(result, errors, out=result)
+    add(result, mean, out=result)
+    return result
+
+
+def _samples_with_covariance_L(
+    mean: NDArray[double], cov_L: NDArray[double], n_samples: int, gen: Generator
+) -> NDArray[double]:
+    if cov_L.ndim == 1:
+        return _samples_normal(mean, cov_L, n_samples, gen)
+
+    # A single matrix-matrix product for all the samples: x = zLᵀ + μ. As for trmv in
+    # `next_sample()`, only the lower triangle of L is used, the product is done in the
+    # dtype of the mean.
+    cov_L = tril(cov_L).astype(mean.dtype, copy=False)
+    result = matmul(
+        gen.standard_normal(size=(n_samples, *mean.shape), dtype=mean.dtype), cov_L.T
+    )
+    add(result, mean, out=result)
+    return result
+
+
+def _samples_normal_stats(
+    mean: NDArray[double], n_samples: int, gen: Generator
+) -> NDArray[double]:
+    return _samples_normal(mean, sqrt(mean), n_samples, gen)
+
+
+def _samples_poisson(mean: NDArray[double], n_samples: int, gen: Generator) -> NDArray[double]:
+    return gen.poisson(mean, size=(n_samples, *mean.shape)).astype(mean.dtype)
 
 
 class MonteCarlo(BlockToOneNode):
@@ -111,7 +194,7 @@ class MonteCarlo(BlockToOneNode):
         `i`: generated sample
 
     extra arguments:
-        `generator`: generator of pseudorandom sequence
+        `generator`: generator of pseudorandom sequence, by default `PCG64` with seed 0
         `mode`:
             * `asimov`: store input data without fluctuations
             * `normal`: normal distribution without correlations (2 inputs)
@@ -124,12 +207,16 @@ class MonteCarlo(BlockToOneNode):
     __slots__ = (
         "_mode",
         "_generator",
+        "_io_data",
+        "_kernels",
     )
 
     _mode: Literal[
         "asimov", "normal", "normal-stats", "normal-unit", "poisson", "covariance"
     ]
     _generator: Generator | None
+    _io_data: tuple[tuple[NDArray, ...], ...]
+    _kernels: tuple[Callable | tuple, ...]
 
     def __new__(
         cls,
@@ -156,6 +243,8 @@ class MonteCarlo(BlockToOneNode):
         **kwargs
     ):
         self._generator = self._create_generator() if generator is None else generator
+        self._io_data = ()
+        self._kernels = ()
         super().__init__(name, *args, **kwargs)
         self._functions_dict.update({"asimov": self._function_asimov})
 
@@ -167,12 +256,31 @@ class MonteCarlo(BlockToOneNode):
     def _function_asimov(self) -> None:
         raise NotImplementedError()
 
+    @abstractmethod
+    def _samples(self, n_samples: int) -> tuple[NDArray, ...]:
+        raise NotImplementedError()
+
     def next_sample(self) -> None:
         self.unfreeze()
         self.taint()
         self.touch()
         # freeze() is called within function
 
+    def next_samples(self, n_samples: int) -> tuple[NDArray, ...]:
+        """Generate `n_samples` samples at once, the outputs are not modified.
+
+        Returns a tuple with an array of shape `(n_samples, *shape)` for each output. The
+        random numbers for all the samples of an output are generated with a single call,
+        which is faster than calling `next_sample()` `n_samples` times.
+        """
+        if not self.closed:
+            raise UnclosedGraphError("Cannot evaluate not closed node!", node=self)
+
+        for callback in self._input_nodes_callbacks:
+            callback()
+
+        return self._samples(n_samples)
+
     def reset(self) -> None:
         self.unfreeze()
         self.taint()
@@ -189,13 +297,15 @@ class MonteCarlo(BlockToOneNode):
         elif mode in MonteCarloShapeModes:
             return MonteCarloShape
 
-        raise RuntimeError(f"Invalid MonteCarlo mode {mode}. Expect: {MonteCarloModes}")
+        raise RuntimeError(
+            f"Invalid MonteCarlo mode {mode}. Expect: {', '.join(sorted(MonteCarloModes))}"
+        )
 
     @staticmethod
     def _create_generator() -> Generator:
-        from numpy.random import MT19937, Generator
+        from numpy.random import PCG64, Generator
 
-        algo = MT19937(seed=0)
+        algo = PCG64(seed=0)
         return Generator(algo)
 
 
@@ -254,19 +364,27 @@ class MonteCarloShape(MonteCarlo):
             callback()
 
         for outdata in self._output_data:
-            outdata[:] = 0.0
+            outdata.fill(0.0)
         # We need to set the flag frozen manually
-        self.fd.frozen = True
+        self._fd.frozen = True
 
     def _function_normal_unit(self) -> None:
         for callback in self._input_nodes_callbacks:
             callback()
 
+        generator = self._generator
         for outdata in self._output_data:
-            _random_fill_normal(outdata, self._generator)
+            generator.standard_normal(dtype=outdata.dtype, out=outdata)
 
         # We need to set the flag frozen manually
-        self.fd.frozen = True
+        self._fd.frozen = True
+
+    def _samples(self, n_samples: int) -> tuple[NDArray, ...]:
+        generator = self._generator
+        return tuple(
+            generator.standard_normal(size=(n_samples, *outdata.shape), dtype=outdata.dtype)
+            for outdata in self._output_data
+        )
 
     def _type_function(self) -> None:
         """A output takes this function to determine the dtype and shape."""
@@ -327,31 +445,49 @@ class MonteCarloLoc(MonteCarlo):
         for callback in self._input_nodes_callbacks:
             callback()
 
-        for indata, outdata in zip(self._input_data, self._output_data):
-            outdata[:] = indata[:]
+        for indata, outdata in self._io_data:
+            copyto(outdata, indata)
 
         # We need to set the flag frozen manually
-        self.fd.frozen = True
+        self._fd.frozen = True
 
     def _function_normal_stats(self) -> None:
         for callback in self._input_nodes_callbacks:
             callback()
 
-        for indata, outdata in zip(self._input_data, self._output_data):
-            _random_normal_stats(indata, outdata, self._generator)
+        generator = self._generator
+        for (indata, outdata), kernel in zip(self._io_data, self._kernels):
+            _random_normal_stats(indata, outdata, generator, kernel)
 
         # We need to set the flag frozen manually
-        self.fd.frozen = True
+        self._fd.frozen = True
 
     def _function_poisson(self) -> None:
         for callback in self._input_nodes_callbacks:
             callback()
 
-        for indata, outdata in zip(self._input_data, self._output_data):
-            _poisson(indata, outdata, self._generator)
+        generator = self._generator
+        for indata, outdata in self._io_data:
+            _poisson(indata, outdata, generator)
 
         # We need to set the flag frozen manually
-        self.fd.frozen = True
+        self._fd.frozen = True
+
+    def _samples(self, n_samples: int) -> tuple[NDArray, ...]:
+        generator = self._generator
+        match self.mode:
+            case "asimov":
+                return tuple(_samples_asimov(indata, n_samples) for indata, _ in self._io_data)
+            case "normal-stats":
+                return tuple(
+                    _samples_normal_stats(indata, n_samples, generator)
+                    for indata, _ in self._io_data
+                )
+            case "poisson":
+                return tuple(
+                    _samples_poisson(indata, n_samples, generator) for indata, _ in self._io_data
+                )
+        raise RuntimeError(f"Invalid MonteCarlo mode {self.mode}")
 
     def _type_function(self) -> None:
         """A output takes this function to determine the dtype and shape."""
@@ -362,6 +498,20 @@ class MonteCarloLoc(MonteCarlo):
 
         self.function = self._functions_dict[self.mode]
 
+    def _post_allocate(self) -> None:
+        super()._post_allocate()
+
+        self._io_data = tuple(zip(self._input_data, self._output_data))
+
+        # The kernels are specialized for the allocated arrays, which are passed on each call
+        if self.mode == "normal-stats":
+            self._kernels = tuple(
+                _specialize(_shift_and_scale_stats, indata, outdata)
+                for indata, outdata in self._io_data
+            )
+        else:
+            self._kernels = ()
+
 
 class MonteCarloLocScale(MonteCarlo):
     r"""Generates a random sample distributed according different modes.
@@ -377,6 +527,9 @@ class MonteCarloLocScale(MonteCarlo):
         `mode`:
             * `normal`: normal distribution without correlations (2 inputs)
             * `covariance`: multivariate normal distribution using L-decomposition of the covariance matrix
+
+    For the `covariance` mode the L-decomposition is a lower triangular matrix: only its lower
+    triangle is used.
     """
 
     def __init__(
@@ -416,42 +569,59 @@ class MonteCarloLocScale(MonteCarlo):
         for callback in self._input_nodes_callbacks:
             callback()
 
-        for (indata, _), outdata in zip(self._blocks_input_data, self._output_data):
-            outdata[:] = indata
+        for indata, _, outdata in self._io_data:
+            copyto(outdata, indata)
 
         # We need to set the flag frozen manually
-        self.fd.frozen = True
+        self._fd.frozen = True
 
     def _function_covariance_L(self) -> None:
         for callback in self._input_nodes_callbacks:
             callback()
 
-        for (indata, covariance_L), outdata in zip(
-            self._blocks_input_data, self._output_data
-        ):
+        generator = self._generator
+        for (indata, covariance_L, outdata), kernel in zip(self._io_data, self._kernels):
             _random_with_covariance_L(
                 indata,
                 covariance_L,
                 outdata,
-                self._generator,
+                generator,
+                kernel,
             )
 
         # We need to set the flag frozen manually
-        self.fd.frozen = True
+        self._fd.frozen = True
 
     def _function_normal(self) -> None:
         for callback in self._input_nodes_callbacks:
             callback()
 
-        for (indata, std), outdata in zip(self._blocks_input_data, self._output_data):
+        generator = self._generator
+        for (indata, std, outdata), kernel in zip(self._io_data, self._kernels):
             _random_normal(
                 indata,
                 std,
                 outdata,
-                self._generator,
+                generator,
+                kernel,
             )
         # We need to set the flag frozen manually
-        self.fd.frozen = True
+        self._fd.frozen = True
+
+    def _samples(self, n_samples: int) -> tuple[NDArray, ...]:
+        generator = self._generator
+        match self.mode:
+            case "normal":
+                return tuple(
+                    _samples_normal(indata, std, n_samples, generator)
+                    for indata, std, _ in self._io_data
+                )
+            case "covariance":
+                return tuple(
+                    _samples_with_covariance_L(indata, covariance_L, n_samples, generator)
+                    for indata, covariance_L, _ in self._io_data
+                )
+        raise RuntimeError(f"Invalid MonteCarlo mode {self.mode}")
 
     def _type_function(self) -> None:
         """A output takes this function to determine the dtype and shape."""
@@ -469,3 +639,27 @@ class MonteCarloLocScale(MonteCarlo):
             copy_from_inputs_to_outputs(self, 2 * i, i)
 
         self.function = self._functions_dict[self.mode]
+
+    def _post_allocate(self) -> None:
+        super()._post_allocate()
+
+        self._io_data = tuple(
+            (indata, errors, outdata)
+            for (indata, errors), outdata in zip(self._blocks_input_data, self._output_data)
+        )
+
+        # The kernels are specialized for the allocated arrays, which are passed on each call
+        if self.mode == "covariance":
+            self._kernels = tuple(
+                (
+                    _bind_trmv(covariance_L, outdata)
+                    if covariance_L.ndim == 2
+                    else _specialize(_shift_and_scale, indata, covariance_L, outdata)
+                )
+                for indata, covariance_L, outdata in self._io_data
+            )
+        else:
+            self._kernels = tuple(
+                _specialize(_shift_and_scale, indata, errors, outdata)
+                for indata, errors, outdata in self._io_data
+            )
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from numpy import add, divide, matmul, multiply, subtract, zeros
-from scipy.linalg import solve_triangular
+from numba import njit
+from numpy import add, copyto, empty, subtract, zeros
+from scipy.linalg import LinAlgError
+from scipy.linalg.blas import get_blas_funcs
+from scipy.linalg.lapack import get_lapack_funcs
 
 from ...core.node import Node
 from ...core.type_functions import (
@@ -16,12 +19,36 @@ from ...core.type_functions import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from numpy.typing import NDArray
 
     from ...core.input import Input
     from ...core.output import Output
 
 
+@njit(cache=True)
+def _normalize_1d(
+    value: NDArray,
+    central: NDArray,
+    sigma: NDArray,
+    normvalue: NDArray,
+) -> None:
+    for i in range(len(value)):
+        normvalue[i] = (value[i] - central[i]) / sigma[i]
+
+
+@njit(cache=True)
+def _denormalize_1d(
+    normvalue: NDArray,
+    central: NDArray,
+    sigma: NDArray,
+    value: NDArray,
+) -> None:
+    for i in range(len(value)):
+        value[i] = sigma[i] * normvalue[i] + central[i]
+
+
 class NormalizeCorrelatedVarsTwoWays(Node):
     """Normalize correlated variables or correlate normal variables with linear expression
 
@@ -33,7 +60,15 @@ class NormalizeCorrelatedVarsTwoWays(Node):
 
     __slots__ = (
         "_ndim",
+        "_function_forward",
+        "_function_backward",
         "_matrix",
+        "_matrix_buffer",
+        "_matrix_lapack",
+        "_matrix_lapack_lower",
+        "_matrix_lapack_trans",
+        "_trtrs",
+        "_trmv",
         "_central",
         "_value",
         "_normvalue",
@@ -46,7 +81,15 @@ class NormalizeCorrelatedVarsTwoWays(Node):
     )
 
     _ndim: str
+    _function_forward: Callable
+    _function_backward: Callable
     _matrix: NDArray
+    _matrix_buffer: NDArray | None
+    _matrix_lapack: NDArray
+    _matrix_lapack_lower: int
+    _matrix_lapack_trans: int
+    _trtrs: Callable
+    _trmv: Callable
     _central: NDArray
     _value: NDArray
     _normvalue: NDArray
@@ -97,40 +140,52 @@ class NormalizeCorrelatedVarsTwoWays(Node):
                 "backward_1d": self._fcn_backward_1d,
             }
         )
+        self._function_forward = self._function_backward = self.function
 
     def _fcn_forward_2d(self):
         for callback in self._input_nodes_callbacks:
             callback()
 
+        if self._matrix_buffer is not None:
+            copyto(self._matrix_buffer, self._matrix)
         subtract(self._value, self._central, out=self._normvalue)
-        solve_triangular(
-            self._matrix,
+        _, info = self._trtrs(
+            self._matrix_lapack,
             self._normvalue,
-            lower=True,
-            overwrite_b=True,
-            check_finite=False,
+            lower=self._matrix_lapack_lower,
+            trans=self._matrix_lapack_trans,
+            overwrite_b=1,
         )
+        if info > 0:
+            raise LinAlgError(f"singular matrix: resolution failed at diagonal {info-1}")
 
     def _fcn_backward_2d(self):
         for callback in self._input_nodes_callbacks:
             callback()
 
-        matmul(self._matrix, self._normvalue, out=self._value)
+        if self._matrix_buffer is not None:
+            copyto(self._matrix_buffer, self._matrix)
+        copyto(self._value, self._normvalue)
+        self._trmv(
+            self._matrix_lapack,
+            self._value,
+            lower=self._matrix_lapack_lower,
+            trans=self._matrix_lapack_trans,
+            overwrite_x=1,
+        )
         add(self._value, self._central, out=self._value)
 
     def _fcn_forward_1d(self):
         for callback in self._input_nodes_callbacks:
             callback()
 
-        subtract(self._value, self._central, out=self._normvalue)
-        divide(self._normvalue, self._matrix, out=self._normvalue)
+        _normalize_1d(self._value, self._central, self._matrix, self._normvalue)
 
     def _fcn_backward_1d(self):
         for callback in self._input_nodes_callbacks:
             callback()
 
-        multiply(self._matrix, self._normvalue, out=self._value)
-        add(self._value, self._central, out=self._value)
+        _denormalize_1d(self._normvalue, self._central, self._matrix, self._value)
 
     def taint(
         self,
@@ -149,9 +204,9 @@ class NormalizeCorrelatedVarsTwoWays(Node):
             - value should not be tainted on sigma/central modificantion
         """
         if caller is self._normvalue_input:
-            self.function = self._functions_dict[f"backward_{self._ndim}"]
+            self.function = self._function_backward
         else:
-            self.function = self._functions_dict[f"forward_{self._ndim}"]
+            self.function = self._function_forward
         super().taint(force_taint=force_taint, force_computation=force_computation, caller=caller)
 
     def _type_function(self) -> None:
@@ -169,7 +224,9 @@ class NormalizeCorrelatedVarsTwoWays(Node):
         )
 
         self._ndim = f"{ndim}d"
-        self.function = self._functions_dict[f"forward_{self._ndim}"]
+        self._function_forward = self._functions_dict[f"forward_{self._ndim}"]
+        self._function_backward = self._functions_dict[f"backward_{self._ndim}"]
+        self.function = self._function_forward
 
         self._value = zeros(shape=self._value_input.dd.shape, dtype=self._value_input.dd.dtype)
         self._normvalue = zeros(
@@ -188,3 +245,24 @@ class NormalizeCorrelatedVarsTwoWays(Node):
 
         self._matrix = self.inputs["matrix"]._data
         self._central = self.inputs["central"]._data
+
+        if self._ndim == "2d":
+            # trtrs and trmv work in place only on the arrays of their own dtype: bind them for
+            # the dtype of value and normvalue, and copy L of a different dtype to a buffer
+            dtype = self._value.dtype
+            if self._matrix.dtype == dtype:
+                self._matrix_buffer = None
+                matrix = self._matrix
+            else:
+                self._matrix_buffer = matrix = empty(self._matrix.shape, dtype=dtype, order="F")
+
+            # trtrs and trmv expect Fortran ordering: for C ordered L the transposed system
+            # (Lᵀ)ᵀz = x-μ is solved (product is computed), which avoids copying the matrix
+            if matrix.flags.f_contiguous:
+                self._matrix_lapack = matrix
+                self._matrix_lapack_lower, self._matrix_lapack_trans = 1, 0
+            else:
+                self._matrix_lapack = matrix.T
+                self._matrix_lapack_lower, self._matrix_lapack_trans = 0, 1
+            (self._trtrs,) = get_lapack_funcs(("trtrs",), dtype=dtype)
+            self._trmv = get_blas_funcs("trmv", dtype=dtype)
@@ -1,5 +1,6 @@
 from matplotlib.pyplot import close, subplots
-from numpy import allclose, linspace, meshgrid, pi, vectorize
+from numpy import allclose, linspace, multiply, pi
+from numpy.typing import NDArray
 from pytest import mark, raises
 
 from dag_modelling.core.exception import CalculationError, CriticalError, TypeFunctionError
@@ -66,28 +67,24 @@ def test_IntegratorCore_trap(debug_graph, test_name, output_path: str):
     savegraph(graph, f"{output_path}/{test_name}.png")
 
 
-def f0(x: float) -> float:
-    return 4 * x**3 + 3 * x**2 + 2 * x - 1
+def f0(x: NDArray) -> NDArray:
+    return ((4 * x + 3) * x + 2) * x - 1
 
 
-def fres(x: float) -> float:
-    return x**4 + x**3 + x**2 - x
-
-
-vecF0 = vectorize(f0)
-vecFres = vectorize(fres)
+def fres(x: NDArray) -> NDArray:
+    return (((x + 1) * x + 1) * x - 1) * x
 
 
 class Polynomial0(OneToOneNode):
     def _function(self):
         for indata, outdata in zip(self.inputs.iter_data(), self.outputs.iter_data_unsafe()):
-            outdata[:] = vecF0(indata)
+            outdata[:] = f0(indata)
 
 
 class PolynomialRes(OneToOneNode):
     def _function(self):
         for indata, outdata in zip(self.inputs.iter_data(), self.outputs.iter_data_unsafe()):
-            outdata[:] = vecFres(indata)
+            outdata[:] = fres(indata)
 
 
 def test_IntegratorCore_gl1d(debug_graph, test_name, output_path: str):
@@ -120,9 +117,9 @@ def test_IntegratorCore_gl2d(debug_graph, test_name, output_path: str):
         scale = 1.0
 
         def _function(self):
-            self.outputs["result"]._data[:] = (
-                self.scale * vecF0(self.inputs[1].data) * vecF0(self.inputs[0].data)
-            )
+            out = self.outputs["result"]._data
+            multiply(f0(self.inputs[1].data), f0(self.inputs[0].data), out=out)
+            out *= self.scale
 
     with Graph(debug=debug_graph, close_on_exit=True) as graph:
         npointsX, npointsY = 10, 20
@@ -138,8 +135,8 @@ def test_IntegratorCore_gl2d(debug_graph, test_name, output_path: str):
         )
         orders_x = Array("orders_x", [2] * npointsX, edges=edgesX["array"], mode="store")
         orders_y = Array("orders_y", [2] * npointsY, edges=edgesY["array"], mode="store")
-        x0, y0 = meshgrid(edgesX._data[:-1], edgesY._data[:-1], indexing="ij")
-        x1, y1 = meshgrid(edgesX._data[1:], edgesY._data[1:], indexing="ij")
+        x0, x1 = edgesX._data[:-1, None], edgesX._data[1:, None]
+        y0, y1 = edgesY._data[None, :-1], edgesY._data[None, 1:]
         X0, X1 = Array("X0", x0, mode="fill"), Array("X1", x1)
         Y0, Y1 = Array("Y0", y0, mode="fill"), Array("Y1", y1)
         sampler = IntegratorSampler("sampler", mode="gl2d")
@@ -178,34 +175,22 @@ def test_IntegratorCore_gl2d(debug_graph, test_name, output_path: str):
         edgesY["array"],
     ]
 
-    subplots(1, 1, subplot_kw={"projection": "3d"})
-    plot_auto(integrator, plotoptions="bar3d", colorbar=True)
-
-    subplots(1, 1)
-    plot_auto(integrator, plotoptions="pcolormesh", colorbar=True)
-
-    subplots(1, 1)
-    plot_auto(integrator, plotoptions="pcolor", colorbar=True)
-
-    subplots(1, 1)
-    plot_auto(integrator, plotoptions="pcolorfast", colorbar=True)
-
-    subplots(1, 1)
-    plot_auto(integrator, plotoptions="imshow", colorbar=True)
-
-    subplots(1, 1)
-    plot_auto(integrator, plotoptions="matshow", colorbar=True)
-
-    subplots(1, 1)
-    plot_auto(integrator, plotoptions="matshow", extent=None, colorbar=True)
-
-    for _ in range(7):
-        close()
-
     poly0.scale = 2.2
     poly0.taint()
     assert allclose(integrator.outputs[0].data, res * poly0.scale, atol=1e-10)
 
+    for plotoptions, subplot_kw, kwargs in (
+        ("bar3d", {"projection": "3d"}, {}),
+        ("pcolormesh", None, {}),
+        ("pcolor", None, {}),
+        ("pcolorfast", None, {}),
+        ("imshow", None, {}),
+        ("matshow", None, {}),
+        ("matshow", None, {"extent": None}),
+    ):
+        subplots(1, 1, subplot_kw=subplot_kw)
+        plot_auto(integrator, plotoptions=plotoptions, colorbar=True, **kwargs)
+        close()
 
     savegraph(graph, f"{output_path}/{test_name}.png")
 
@@ -214,8 +199,8 @@ def test_IntegratorCore_gl2d(debug_graph, test_name, output_path: str):
 def test_IntegratorCore_gl2to1d_x(debug_graph, test_name, dropdim, output_path: str):
     class Polynomial21(ManyToOneNode):
         def _function(self):
-            self.outputs["result"]._data[:] = vecF0(self.inputs[1].data) * vecF0(
-                self.inputs[0].data
+            multiply(
+                f0(self.inputs[1].data), f0(self.inputs[0].data), out=self.outputs["result"]._data
             )
 
     with Graph(debug=debug_graph, close_on_exit=True) as graph:
@@ -232,8 +217,8 @@ def test_IntegratorCore_gl2to1d_x(debug_graph, test_name, dropdim, output_path:
         )
         orders_x = Array("orders_x", [2] * npointsX, edges=edgesX["array"], mode="store")
         orders_y = Array("orders_y", [2], edges=edgesY["array"], mode="store")
-        x0, y0 = meshgrid(edgesX._data[:-1], edgesY._data[:-1], indexing="ij")
-        x1, y1 = meshgrid(edgesX._data[1:], edgesY._data[1:], indexing="ij")
+        x0, x1 = edgesX._data[:-1, None], edgesX._data[1:, None]
+        y0, y1 = edgesY._data[None, :-1], edgesY._data[None, 1:]
         X0, X1 = Array("X0", x0, mode="fill"), Array("X1", x1)
         Y0, Y1 = Array("Y0", y0, mode="fill"), Array("Y1", y1)
         sampler = IntegratorSampler("sampler", mode="gl2d")
@@ -280,8 +265,8 @@ def test_IntegratorCore_gl2to1d_x(debug_graph, test_name, dropdim, output_path:
 def test_IntegratorCore_gl2to1d_y(debug_graph, test_name, dropdim, output_path: str):
     class Polynomial21(ManyToOneNode):
         def _function(self):
-            self.outputs["result"]._data[:] = vecF0(self.inputs[1].data) * vecF0(
-                self.inputs[0].data
+            multiply(
+                f0(self.inputs[1].data), f0(self.inputs[0].data), out=self.outputs["result"]._data
             )
 
     with Graph(debug=debug_graph, close_on_exit=True) as graph:
@@ -294,8 +279,8 @@ def test_IntegratorCore_gl2to1d_y(debug_graph, test_name, dropdim, output_path:
         )
         orders_x = Array("orders_x", [2], edges=edgesX["array"], mode="store")
         orders_y = Array("orders_y", [2] * npointsY, edges=edgesY["array"], mode="store")
-        x0, y0 = meshgrid(edgesX._data[:-1], edgesY._data[:-1], indexing="ij")
-        x1, y1 = meshgrid(edgesX._data[1:], edgesY._data[1:], indexing="ij")
+        x0, x1 = edgesX._data[:-1, None], edgesX._data[1:, None]
+        y0, y1 = edgesY._data[None, :-1], edgesY._data[None, 1:]
         X0, X1 = Array("X0", x0, mode="fill"), Array("X1", x1)
         Y0, Y1 = Array("Y0", y0, mode="fill"), Array("Y1", y1)
         sampler = IntegratorSampler("sampler", mode="gl2d")
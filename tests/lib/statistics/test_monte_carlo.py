@@ -1,7 +1,7 @@
 from os.path import join
 
 from matplotlib import pyplot as plt
-from numpy import allclose, arange, diag, dot, eye, fabs, fill_diagonal, ones
+from numpy import allclose, arange, array, diag, dot, eye, fabs, fill_diagonal, ones, triu
 from numpy.linalg import cholesky, inv
 from numpy.random import MT19937, Generator, SeedSequence
 from pytest import mark, raises
@@ -376,3 +376,82 @@ def test_mc_nonexistent_mode(mcmode, debug_graph, test_name, tmp_path):
     with Graph(close_on_exit=True, debug=debug_graph) as graph:
         with raises(RuntimeError) as exc:
             toymc = MonteCarlo(name="MonteCarlo", mode=mcmode)
+
+
+@mark.parametrize("order", ["C", "F"])
+def test_mc_covariance_order(order, debug_graph):
+    size = 20
+    data = 1.0 + arange(size, dtype="d")
+    L = cholesky(eye(size) + 0.5)
+
+    with Graph(close_on_exit=True, debug=debug_graph):
+        mcdata = Array("data", data)
+        mc_L = Array("L", array(L, order=order))
+        toymc = MonteCarlo(
+            name="MonteCarlo", mode="covariance", generator=Generator(MT19937(1))
+        )
+        (mcdata, mc_L) >> toymc
+
+    assert mc_L.outputs[0].data.flags[f"{order}_CONTIGUOUS"]
+
+    toymc.next_sample()
+    sample = Generator(MT19937(1)).standard_normal(size)
+    assert allclose(toymc.outputs[0].data, data + L @ sample, atol=1e-14, rtol=0)
+
+
+@mark.parametrize("dtype_L", ("d", "f"))
+@mark.parametrize("dtype", ("d", "f"))
+def test_mc_covariance_dtype(dtype, dtype_L, debug_graph):
+    size = 5
+    data = 1.0 + arange(size, dtype=dtype)
+    L = cholesky(eye(size) + 0.5).astype(dtype_L)
+
+    with Graph(close_on_exit=True, debug=debug_graph):
+        mcdata = Array("data", data)
+        mc_L = Array("L", L)
+        toymc = MonteCarlo(
+            name="MonteCarlo", mode="covariance", generator=Generator(MT19937(1))
+        )
+        (mcdata, mc_L) >> toymc
+
+    toymc.next_sample()
+    sample = Generator(MT19937(1)).standard_normal(size, dtype=dtype)
+    result = toymc.outputs[0].data
+    assert result.dtype == dtype
+    assert allclose(result, data + L @ sample, atol=1e-5, rtol=0)
+
+
+@mark.parametrize(
+    "mcmode",
+    ["asimov", "normal-stats", "normal-unit", "poisson", "normal", "covariance"],
+)
+def test_mc_next_samples(mcmode, debug_graph):
+    size, n_samples = 20, 5
+    data = (size + arange(size, dtype="d")) * 10.0
+    L = cholesky(10.0 * eye(size) + 1.0)
+    # the upper triangle is ignored by both next_sample() and next_samples()
+    L_full = L + triu(ones((size, size)), 1)
+
+    with Graph(close_on_exit=True, debug=debug_graph):
+        mcdata = Array("data", data)
+        mc_error = Array("error", L_full if mcmode == "covariance" else diag(L))
+        kwargs = {"shape": (size,)} if mcmode == "normal-unit" else {}
+        toymc0 = MonteCarlo(
+            name="MonteCarlo", mode=mcmode, generator=Generator(MT19937(1)), **kwargs
+        )
+        toymc1 = MonteCarlo(
+            name="MonteCarlo", mode=mcmode, generator=Generator(MT19937(1)), **kwargs
+        )
+        if mcmode in ("normal", "covariance"):
+            (mcdata, mc_error) >> toymc0
+            (mcdata, mc_error) >> toymc1
+        elif mcmode != "normal-unit":
+            mcdata >> toymc0
+            mcdata >> toymc1
+
+    (samples,) = toymc0.next_samples(n_samples)
+    assert samples.shape == (n_samples, size)
+
+    for sample in samples:
+        toymc1.next_sample()
+        assert allclose(sample, toymc1.outputs[0].data, atol=1e-10, rtol=0)
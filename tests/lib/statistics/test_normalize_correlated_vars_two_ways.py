@@ -285,3 +285,68 @@ def test_NormalizeCorrelatedVarsTwoWays_01(dtype="d"):
 
     with raises(TypeFunctionError):
         graph2.close()
+
+
+@mark.parametrize("order", ("C", "F"))
+def test_NormalizeCorrelatedVarsTwoWays_02(order: str, dtype="d"):
+    inCentral = arange(3.0, dtype=dtype) * 100.0
+    inV = array([[10, 2, 1], [2, 12, 3], [1, 3, 13]], dtype=dtype)
+    inL = array(cholesky(inV, lower=True), order=order)
+    inOffset = array((-10.0, 20.0, 30.0), dtype=dtype)
+    inVec = inCentral + inOffset
+    inNorm = full_like(inVec, -100)
+    with Graph(close_on_exit=True):
+        Lmatrix = Array("L", inL)
+        central = Array("central", inCentral)
+        value = Array("vec", inVec, mode="store_weak")
+        normvalue = Array("normvalue", inNorm, mode="store_weak")
+        norm2d = NormalizeCorrelatedVarsTwoWays("norm2d")
+
+        central >> norm2d.inputs["central"]
+        Lmatrix >> norm2d.inputs["matrix"]
+        (value, normvalue) >> norm2d
+
+    assert Lmatrix.outputs[0].data.flags[f"{order}_CONTIGUOUS"]
+
+    norm = solve_triangular(inL, inOffset, lower=True)
+    assert allclose(norm2d.get_data(1), norm, atol=0, rtol=1e-14)
+
+    inNormNew = array((1.0, -2.0, 3.0), dtype=dtype)
+    normvalue.set(inNormNew)
+    assert allclose(norm2d.get_data(0), inL @ inNormNew + inCentral, atol=0, rtol=1e-14)
+
+
+@mark.parametrize("dtype_L", ("d", "f"))
+@mark.parametrize("dtype", ("d", "f"))
+def test_NormalizeCorrelatedVarsTwoWays_03(dtype: str, dtype_L: str):
+    fp_tolerance = finfo("f").resolution * 10
+
+    inCentral = arange(3.0, dtype=dtype) * 100.0
+    inV = array([[10, 2, 1], [2, 12, 3], [1, 3, 13]], dtype="d")
+    inL = cholesky(inV, lower=True).astype(dtype_L)
+    inOffset = array((-10.0, 20.0, 30.0), dtype=dtype)
+    inVec = inCentral + inOffset
+    inNorm = full_like(inVec, -100)
+    with Graph(close_on_exit=True):
+        Lmatrix = Array("L", inL)
+        central = Array("central", inCentral)
+        value = Array("vec", inVec, mode="store_weak")
+        normvalue = Array("normvalue", inNorm, mode="store_weak")
+        norm2d = NormalizeCorrelatedVarsTwoWays("norm2d")
+
+        central >> norm2d.inputs["central"]
+        Lmatrix >> norm2d.inputs["matrix"]
+        (value, normvalue) >> norm2d
+
+    norm = solve_triangular(inL, inOffset, lower=True)
+    assert norm2d.get_data(1).dtype == dtype
+    assert allclose(norm2d.get_data(1), norm, atol=0, rtol=fp_tolerance)
+
+    inNormNew = array((1.0, -2.0, 3.0), dtype=dtype)
+    normvalue.set(inNormNew)
+    assert norm2d.get_data(0).dtype == dtype
+    assert allclose(norm2d.get_data(0), inL @ inNormNew + inCentral, atol=0, rtol=fp_tolerance)
+
+    # the value is kept, the normvalue is recomputed for the updated matrix
+    Lmatrix.set(2.0 * inL)
+    assert allclose(norm2d.get_data(1), 0.5 * inNormNew, atol=0, rtol=fp_tolerance)